@@ -4,6 +4,7 @@ import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 import joblib
+import json
 
 def train_and_save_model():
     # Sample dataset
@@ -19,11 +20,12 @@ def train_and_save_model():
     X = df.drop('price', axis=1)
     y = df['price']
 
-    model = RandomForestRegressor()
+    model = RandomForestRegressor(n_estimators=200, n_jobs=-1, max_features="sqrt", random_state=42)
     model.fit(X, y)
 
-    joblib.dump(model, 'car_price_model.pkl')
-    joblib.dump(list(X.columns), 'model_columns.pkl')
+    joblib.dump(model, 'car_price_model.pkl', compress=3)
+    with open('model_columns.json', 'w') as f:
+        json.dump(list(X.columns), f)
 
 if __name__ == '__main__':
     train_and_save_model()
\ No newline at end of file
@@ -1,20 +1,81 @@
 from __future__ import annotations
 
+import functools
+import os
 import re
+import threading
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from html import escape as _html_escape
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
 
+import torch
 from langdetect import detect, DetectorFactory
 from transformers import (
     AutoModelForSeq2SeqLM,
+    AutoModelForSequenceClassification,
     AutoTokenizer,
-    pipeline,
 )
 
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+except ImportError:  # ONNX Runtime is optional; fall back to eager PyTorch
+    ort = None
+
+try:
+    import intel_extension_for_pytorch as ipex
+except ImportError:  # IPEX is optional; plain autocast is used without it
+    ipex = None
+
+try:
+    import streamlit as st
+except ImportError:  # Streamlit is optional; cache in-process without it
+    st = None
+
+try:
+    import cpuinfo
+except ImportError:  # py-cpuinfo is optional; without it we assume no VNNI
+    cpuinfo = None
+
 
 # Make langdetect deterministic
 DetectorFactory.seed = 42
 
+# Sentence splitting: pad CJK terminators with a space, then split after any terminator
+_CJK_TERM = re.compile(r"([。！？])")
+_SENT_SPLIT = re.compile(r"(?<=[\.!?。！？])\s+")
+
+# Cheap English check used to skip langdetect/M2M100 for English-dominant input
+_ASCII_RE = re.compile(r"[A-Za-z]")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_WORD_RE = re.compile(r"[A-Za-z']+")
+_EN_FUNCTION_WORDS = frozenset(
+    "the of and to that for it was on with as are be this by at from has have not will said were they".split()
+)
+
+# Use Streamlit's resource cache when running inside an app, else a plain process-wide cache
+_cache_resource = st.cache_resource if st is not None else functools.lru_cache(maxsize=None)
+
+# The shared M2M100 tokenizer carries src_lang as state; guard set-and-encode across sessions
+_TRANS_TOKENIZER_LOCK = threading.Lock()
+
+TRANSLATION_MODEL_NAME = "facebook/m2m100_418M"
+NLI_MODEL_NAME = "facebook/bart-large-mnli"
+
+# Where ONNX exports are cached so the (slow) export only happens once per machine
+ONNX_CACHE_DIR = Path(os.environ.get("FAKE_NEWS_ONNX_CACHE", Path.home() / ".cache" / "fake_news_onnx"))
+
+# Premise/hypothesis pairs per NLI forward pass (8/16/32 are the sensible values to tune)
+ZERO_SHOT_BATCH_SIZE = 16
+
+# Sentences classified per article; the rest are reported as neutral (0.5)
+MAX_SCORED_SENTENCES = 40
+
+# Sentences per M2M100 generate() call when translating long articles
+TRANSLATION_BATCH_SIZE = 16
+
 
 @dataclass
 class SentenceScore:
@@ -22,6 +83,7 @@ class SentenceScore:
     true_score: float  # probability the sentence is true
 
 
+@functools.lru_cache(maxsize=256)
 def map_langdetect_to_m2m(lang_code: str) -> str:
     """Map langdetect language code to M2M100 language code.
 
@@ -52,26 +114,139 @@ def map_langdetect_to_m2m(lang_code: str) -> str:
     return lang_code[:2]
 
 
+def _ort_session_options() -> "ort.SessionOptions":
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = os.cpu_count() or 1
+    return options
+
+
+def _cpu_supports_vnni() -> bool:
+    """Return True when the CPU has int8 dot-product (AVX-512 VNNI / AVX-VNNI) instructions."""
+    if cpuinfo is None:
+        return False
+    flags = set(cpuinfo.get_cpu_info().get("flags", []))
+    return bool(flags & {"avx512_vnni", "avx512vnni", "avx_vnni", "avxvnni"})
+
+
+def _cpu_supports_bf16() -> bool:
+    """Return True when the CPU has native BF16 matmul support (AVX-512 BF16 or AMX)."""
+    checks = ("_is_avx512_bf16_supported", "_is_amx_tile_supported")
+    return any(getattr(torch.cpu, name, lambda: False)() for name in checks)
+
+
+def _export_onnx(model_cls, model_name: str) -> Path:
+    """Export model_name to ONNX under ONNX_CACHE_DIR (once) and return the export directory."""
+    export_dir = ONNX_CACHE_DIR / model_name.replace("/", "--")
+    if not (export_dir / "config.json").exists():
+        model_cls.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+    return export_dir
+
+
+def _load_ort_model(model_cls, model_name: str):
+    """Load an ONNX Runtime model, exporting it from the Hub checkpoint on first use."""
+    export_dir = _export_onnx(model_cls, model_name)
+    return model_cls.from_pretrained(export_dir, session_options=_ort_session_options())
+
+
+def _load_ort_classifier(model_name: str):
+    """Load the sequence classifier, INT8-quantized when the CPU has VNNI.
+
+    The quantized graph is written next to the FP32 export and reused afterwards.
+    CPUs without VNNI keep the FP32 graph.
+    """
+    if not _cpu_supports_vnni():
+        return _load_ort_model(ORTModelForSequenceClassification, model_name)
+    export_dir = _export_onnx(ORTModelForSequenceClassification, model_name)
+    int8_path = export_dir / "model-int8.onnx"
+    if not int8_path.exists():
+        quantize_dynamic(
+            model_input=export_dir / "model.onnx",
+            model_output=int8_path,
+            weight_type=QuantType.QInt8,
+            op_types_to_quantize=["MatMul", "Attention"],
+        )
+    return ORTModelForSequenceClassification.from_pretrained(
+        export_dir,
+        file_name=int8_path.name,
+        session_options=_ort_session_options(),
+    )
+
+
+@_cache_resource
+def _load_models():
+    """Load (trans_tokenizer, trans_model, nli_tokenizer, nli_model, use_bf16) for FakeNewsService.
+
+    Cached with st.cache_resource so Streamlit reruns and sessions reuse the same models.
+    """
+    trans_tokenizer = AutoTokenizer.from_pretrained(TRANSLATION_MODEL_NAME)
+    nli_tokenizer = AutoTokenizer.from_pretrained(NLI_MODEL_NAME)
+
+    # BF16 only applies to the eager PyTorch translation model
+    use_bf16 = False
+
+    if ort is not None:
+        # Serve both models through ONNX Runtime (fused graphs, MLAS kernels)
+        trans_model = _load_ort_model(ORTModelForSeq2SeqLM, TRANSLATION_MODEL_NAME)
+        nli_model = _load_ort_classifier(NLI_MODEL_NAME)
+    else:
+        trans_model = AutoModelForSeq2SeqLM.from_pretrained(TRANSLATION_MODEL_NAME).eval()
+        use_bf16 = _cpu_supports_bf16()
+        if use_bf16 and ipex is not None:
+            trans_model = ipex.optimize(trans_model, dtype=torch.bfloat16)
+        nli_model = AutoModelForSequenceClassification.from_pretrained(
+            NLI_MODEL_NAME, torch_dtype=torch.float32
+        ).eval()
+    return trans_tokenizer, trans_model, nli_tokenizer, nli_model, use_bf16
+
+
 class FakeNewsService:
     """Backend service for multilingual fake news detection with translation and highlighting."""
 
     def __init__(self) -> None:
         # Translation model (multilingual to English)
-        self.translation_model_name = "facebook/m2m100_418M"
-        self.trans_tokenizer = AutoTokenizer.from_pretrained(self.translation_model_name)
-        self.trans_model = AutoModelForSeq2SeqLM.from_pretrained(self.translation_model_name)
-
+        self.translation_model_name = TRANSLATION_MODEL_NAME
         # Zero-shot classifier (general purpose)
         # Using BART MNLI for robust zero-shot classification
-        self.zero_shot = pipeline(
-            "zero-shot-classification",
-            model="facebook/bart-large-mnli",
-            device=-1,
-        )
+        self.nli_model_name = NLI_MODEL_NAME
+
+        # Models are loaded once per process and shared by every service instance
+        (
+            self.trans_tokenizer,
+            self.trans_model,
+            self.nli_tokenizer,
+            self.nli_model,
+            self.use_bf16,
+        ) = _load_models()
+        self._en_bos_id = self.trans_tokenizer.get_lang_id("en")
 
         # Candidate labels for truth assessment
         self.candidate_labels = ["true", "false"]
         self.hypothesis_template = "This statement is {}."
+        # Hypotheses are the same for every sentence, so tokenize them once
+        self._hyp_ids = [
+            self.nli_tokenizer(self.hypothesis_template.format(label), add_special_tokens=False)["input_ids"]
+            for label in self.candidate_labels
+        ]
+        self._entail_id = next(
+            idx for label, idx in self.nli_model.config.label2id.items() if label.lower().startswith("entail")
+        )
+
+    @staticmethod
+    def looks_english(text: str) -> bool:
+        """Fast heuristic for English-dominant text.
+
+        Requires the letters to be almost all ASCII and common English function words
+        to be frequent; ASCII alone would also match French, Spanish, German, etc.
+        """
+        ascii_letters = len(_ASCII_RE.findall(text))
+        if ascii_letters <= 0.85 * max(len(_LETTER_RE.findall(text)), 1):
+            return False
+        words = _WORD_RE.findall(text.lower())
+        if not words:
+            return False
+        function_words = sum(1 for w in words if w in _EN_FUNCTION_WORDS)
+        return function_words >= 0.15 * len(words)
 
     def detect_language(self, text: str) -> str:
         try:
@@ -86,16 +261,41 @@ class FakeNewsService:
             return text
 
         m2m_src = map_langdetect_to_m2m(src_lang)
-        # Configure tokenizer for source language
-        self.trans_tokenizer.src_lang = m2m_src
-        encoded = self.trans_tokenizer(text, return_tensors="pt", truncation=True, max_length=1024)
-        generated_tokens = self.trans_model.generate(
-            **encoded,
-            forced_bos_token_id=self.trans_tokenizer.get_lang_id("en"),
-            max_new_tokens=1024,
-        )
-        translated = self.trans_tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
-        return translated[0]
+        sentences = self.split_into_sentences(text)
+        if len(sentences) <= 1:
+            return self._generate_translations([text], m2m_src)[0]
+
+        # Translate sentence by sentence: many short sequences are much cheaper than one
+        # long one under quadratic attention. Length-sorted batches keep padding low.
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        translated = [""] * len(sentences)
+        for start in range(0, len(order), TRANSLATION_BATCH_SIZE):
+            batch = order[start:start + TRANSLATION_BATCH_SIZE]
+            for i, out in zip(batch, self._generate_translations([sentences[i] for i in batch], m2m_src)):
+                translated[i] = out
+        return " ".join(translated)
+
+    def _generate_translations(self, texts: List[str], m2m_src: str) -> List[str]:
+        """Translate a batch of texts from M2M100 language m2m_src to English in one generate() call."""
+        with _TRANS_TOKENIZER_LOCK:
+            # Configure tokenizer for source language
+            self.trans_tokenizer.src_lang = m2m_src
+            encoded = self.trans_tokenizer(
+                texts, return_tensors="pt", padding="longest", truncation=True, max_length=1024
+            )
+        # English output rarely runs much longer than the source; cap generation accordingly
+        max_new_tokens = min(1024, max(16, int(1.3 * encoded["input_ids"].shape[1])))
+        with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16, enabled=self.use_bf16):
+            # Greedy decoding is plenty for a translation that only feeds the classifier
+            generated_tokens = self.trans_model.generate(
+                **encoded,
+                forced_bos_token_id=self._en_bos_id,
+                max_new_tokens=max_new_tokens,
+                num_beams=1,
+                do_sample=False,
+                no_repeat_ngram_size=3,
+            )
+        return self.trans_tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
 
     @staticmethod
     def split_into_sentences(text: str) -> List[str]:
@@ -103,41 +303,53 @@ class FakeNewsService:
             return []
         # Handle common sentence terminators including CJK
         # First, ensure that CJK terminators are followed by a space to help splitting
-        text = re.sub(r"([。！？])", r"\1 ", text)
-        parts = re.split(r"(?<=[\.!?。！？])\s+", text.strip())
+        text = _CJK_TERM.sub(r"\1 ", text)
+        parts = _SENT_SPLIT.split(text.strip())
         sentences = [s.strip() for s in parts if s.strip()]
         return sentences
 
+    def _true_scores(self, texts: List[str]) -> List[float]:
+        """Zero-shot probability that each text is true.
+
+        Matches the zero-shot pipeline with multi_label=False: every text is paired with each
+        candidate-label hypothesis and the entailment logits are softmaxed across labels.
+        """
+        tok = self.nli_tokenizer
+        budget = tok.model_max_length - tok.num_special_tokens_to_add(pair=True) - max(map(len, self._hyp_ids))
+        premises = [ids[:budget] for ids in tok(texts, add_special_tokens=False)["input_ids"]]
+        # Batch in order of token length so each batch pads to a similar length
+        order = sorted(range(len(texts)), key=lambda i: len(premises[i]))
+        pairs = [tok.build_inputs_with_special_tokens(premises[i], hyp) for i in order for hyp in self._hyp_ids]
+
+        entail_logits = []
+        with torch.inference_mode():
+            for start in range(0, len(pairs), ZERO_SHOT_BATCH_SIZE):
+                batch = tok.pad({"input_ids": pairs[start:start + ZERO_SHOT_BATCH_SIZE]}, return_tensors="pt")
+                entail_logits.append(self.nli_model(**batch).logits[:, self._entail_id])
+        probs = torch.cat(entail_logits).view(len(texts), len(self._hyp_ids)).softmax(dim=-1)
+        true_probs = probs[:, self.candidate_labels.index("true")].tolist()
+
+        # Scatter back to the original text order
+        scores = [0.0] * len(texts)
+        for i, p in zip(order, true_probs):
+            scores[i] = float(p)
+        return scores
+
     def classify_truth_score(self, text: str) -> float:
         if not text.strip():
             return 0.5
-        result = self.zero_shot(
-            text,
-            self.candidate_labels,
-            hypothesis_template=self.hypothesis_template,
-            multi_label=False,
-        )
-        # result has fields: labels, scores; labels aligned with scores
-        label_to_score: Dict[str, float] = {l.lower(): s for l, s in zip(result["labels"], result["scores"])}
-        # Normalize in case order changes
-        true_score = float(label_to_score.get("true", 0.0))
-        return true_score
+        return self._true_scores([text])[0]
 
-    def classify_sentences(self, sentences: List[str], max_sentences: int = 40) -> List[SentenceScore]:
+    def classify_sentences(
+        self, sentences: List[str], max_sentences: int = MAX_SCORED_SENTENCES
+    ) -> List[SentenceScore]:
         if not sentences:
             return []
         limited = sentences[:max_sentences]
-        results = self.zero_shot(
-            limited,
-            self.candidate_labels,
-            hypothesis_template=self.hypothesis_template,
-            multi_label=False,
-        )
-        scores: List[SentenceScore] = []
-        # results is a dict if input is str, list of dicts if input is list
-        for sent, res in zip(limited, results):
-            label_to_score = {l.lower(): s for l, s in zip(res["labels"], res["scores"])}
-            scores.append(SentenceScore(sentence=sent, true_score=float(label_to_score.get("true", 0.0))))
+        scores: List[SentenceScore] = [
+            SentenceScore(sentence=sent, true_score=score)
+            for sent, score in zip(limited, self._true_scores(limited))
+        ]
 
         # For remaining sentences beyond limit, mark neutral
         for sent in sentences[len(limited):]:
@@ -168,27 +380,24 @@ class FakeNewsService:
             return "#fee2e2"  # red-100
         return "#fef9c3"  # yellow-100
 
-    def build_highlighted_html(self, sentence_scores: List[SentenceScore]) -> str:
-        spans: List[str] = []
+    def _iter_spans(self, sentence_scores: List[SentenceScore]) -> Iterator[str]:
+        # Bind lookups to locals once; this runs once per sentence
+        escape = self._escape_html
+        bg_color = self.sentence_bg_color
         for s in sentence_scores:
-            color = self.sentence_bg_color(s.true_score)
-            conf = int(round(s.true_score * 100))
-            span = (
-                f'<span style="background:{color}; padding:2px 4px; border-radius:4px; margin-right:2px; display:inline;">'
-                f"{self._escape_html(s.sentence)} "
-                f"<small style='opacity:0.7'>(true {conf}%)</small>"
+            yield (
+                f'<span style="background:{bg_color(s.true_score)}; padding:2px 4px; border-radius:4px; margin-right:2px; display:inline;">'
+                f"{escape(s.sentence)} "
+                f"<small style='opacity:0.7'>(true {int(round(s.true_score * 100))}%)</small>"
                 "</span>"
             )
-            spans.append(span)
-        return "<div style='line-height:1.9'>" + " ".join(spans) + "</div>"
+
+    def build_highlighted_html(self, sentence_scores: List[SentenceScore]) -> str:
+        return "<div style='line-height:1.9'>" + " ".join(self._iter_spans(sentence_scores)) + "</div>"
 
     @staticmethod
     def _escape_html(text: str) -> str:
-        return (
-            text.replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-        )
+        return _html_escape(text, quote=False)
 
     def process(self, article_text: str) -> Dict[str, object]:
         article_text = (article_text or "").strip()
@@ -203,13 +412,23 @@ class FakeNewsService:
                 "sentence_scores": [],
             }
 
-        lang = self.detect_language(article_text)
-        translated = self.translate_to_english(article_text, lang)
-        overall_score = self.classify_truth_score(translated)
-        verdict_label, verdict_color = self.verdict_from_score(overall_score)
-
+        if self.looks_english(article_text):
+            lang, translated = "en", article_text
+        else:
+            lang = self.detect_language(article_text)
+            translated = self.translate_to_english(article_text, lang)
         sentences = self.split_into_sentences(translated)
         sent_scores = self.classify_sentences(sentences)
+        # Length-weighted mean of sentence scores; avoids a separate full-article NLI pass.
+        # Only the classified prefix counts: sentences past the limit are neutral filler.
+        scored = sent_scores[:MAX_SCORED_SENTENCES]
+        total_len = sum(len(s.sentence) for s in scored)
+        if total_len:
+            overall_score = sum(len(s.sentence) * s.true_score for s in scored) / total_len
+        else:
+            overall_score = 0.5
+        verdict_label, verdict_color = self.verdict_from_score(overall_score)
+
         highlighted_html = self.build_highlighted_html(sent_scores)
 
         return {
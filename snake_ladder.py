@@ -1,30 +1,87 @@
 # snake_ladder.py
 
+import functools
 import random
 
+SNAKES = {16: 6, 47: 26, 49: 11, 56: 53, 62: 19, 64: 60, 87: 24, 93: 73, 95: 75, 98: 78}
+LADDERS = {1: 38, 4: 14, 9: 31, 21: 42, 28: 84, 36: 44, 51: 67, 71: 91, 80: 100}
+
+
+def _build_jump(snakes, ladders):
+    """Flat lookup: entry i is where landing on square i takes you."""
+    jump = list(range(101))
+    for start, end in {**snakes, **ladders}.items():
+        jump[start] = end
+    return jump
+
+# Shared by SnakeLadderGame.move() and simulate(), so both play the same board
+_JUMP = _build_jump(SNAKES, LADDERS)
+
+
+def _play_games(jump, n_games, roll):
+    """Play n_games two-player games, rolling with roll(); returns the rolls each game took.
+
+    Kept to plain Python that numba can compile, so snake_ladder_jit runs this same loop.
+    """
+    turns = []
+    for _ in range(n_games):
+        positions = [0, 0]
+        player = 0
+        rolls = 0
+        while True:
+            rolls += 1
+            pos = positions[player] + roll()
+            if pos <= 100:  # Can't move past 100
+                pos = jump[pos]
+                positions[player] = pos
+                if pos == 100:
+                    break
+            player ^= 1
+        turns.append(rolls)
+    return turns
+
 class SnakeLadderGame:
     def __init__(self):
-        self.snakes = {16: 6, 47: 26, 49: 11, 56: 53, 62: 19, 64: 60, 87: 24, 93: 73, 95: 75, 98: 78}
-        self.ladders = {1: 38, 4: 14, 9: 31, 21: 42, 28: 84, 36: 44, 51: 67, 71: 91, 80: 100}
+        self.snakes = dict(SNAKES)
+        self.ladders = dict(LADDERS)
+        self._jump = list(_JUMP)
         self.positions = [0, 0]  # Player 1 and Player 2
         self.current_player = 0
         self.winner = None
 
+    @classmethod
+    def simulate(cls, n, seed=None):
+        """Simulate n complete games; returns a list with the dice rolls each game took.
+
+        Runs numba-compiled when numpy and numba are installed, else as plain Python.
+        The two backends use different RNGs, so a seed only reproduces results within
+        the same backend.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        try:
+            from snake_ladder_jit import simulate_games
+        except ImportError:  # numpy/numba are optional
+            return _play_games(_JUMP, n, functools.partial(random.Random(seed).randint, 1, 6))
+        return simulate_games(_JUMP, n, seed)
+
     def roll_dice(self):
         return random.randint(1, 6)
 
     def move(self, steps):
         if self.winner is not None:
             return
-        pos = self.positions[self.current_player] + steps
+        player = self.current_player
+        positions = self.positions
+        pos = positions[player] + steps
         if pos > 100:
-            pos = self.positions[self.current_player]  # Can't move
+            pos = positions[player]  # Can't move
         else:
-            pos = self.snakes.get(pos, self.ladders.get(pos, pos))
-        self.positions[self.current_player] = pos
+            pos = self._jump[pos]
+        positions[player] = pos
         if pos == 100:
-            self.winner = self.current_player
-        self.current_player = 1 - self.current_player  # Switch player
+            self.winner = player
+        self.current_player = player ^ 1  # Switch player
 
     def get_positions(self):
         return self.positions
@@ -0,0 +1,27 @@
+# snake_ladder_jit.py
+# Numba-compiled bulk simulation for snake_ladder; needs numpy and numba.
+
+import numpy as np
+from numba import njit
+
+from snake_ladder import _play_games
+
+# The same game loop as the plain-Python simulator, compiled
+_play_games_jit = njit(cache=True)(_play_games)
+
+
+@njit(cache=True)
+def _roll():
+    return np.random.randint(1, 7)
+
+
+@njit(cache=True)
+def _seed(seed):
+    # Seeds numba's own RNG, not numpy's global one
+    np.random.seed(seed)
+
+
+def simulate_games(jump, n_games, seed):
+    """Play n_games two-player games on the jump table; returns a list of rolls per game."""
+    _seed(seed)
+    return list(_play_games_jit(np.asarray(jump, dtype=np.int32), n_games, _roll))
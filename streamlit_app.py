@@ -13,32 +13,47 @@ if 'last_roll' not in st.session_state:
 game = st.session_state.game
 
 # Show board (simple 10x10 grid with emojis)
-def draw_board(positions, snakes, ladders):
-    snake_emoji = "🐍"
-    ladder_emoji = "🪜"
-    player1_emoji = "🔴"
-    player2_emoji = "🔵"
-    both_players_emoji = "🟣"
-    board = ""
+SNAKE_EMOJI = "🐍"
+LADDER_EMOJI = "🪜"
+PLAYER1_EMOJI = "🔴"
+PLAYER2_EMOJI = "🔵"
+BOTH_PLAYERS_EMOJI = "🟣"
+
+def cell_index(num):
+    """Return the (row, col) of square num in the board rows (top row first)."""
+    return 9 - (num - 1) // 10, (num - 1) % 10
+
+@st.cache_data
+def base_board(snakes, ladders):
+    """Board rows without players; cached, so only built once per snakes/ladders layout."""
+    snakes, ladders = dict(snakes), dict(ladders)
+    rows = []
     for row in range(10, 0, -1):
+        cells = []
         for col in range(1, 11):
             num = (row - 1) * 10 + col
-            cell = ""
-            if positions[0] == num and positions[1] == num:
-                cell = both_players_emoji
-            elif positions[0] == num:
-                cell = player1_emoji
-            elif positions[1] == num:
-                cell = player2_emoji
-            elif num in snakes:
-                cell = snake_emoji
+            if num in snakes:
+                cell = SNAKE_EMOJI
             elif num in ladders:
-                cell = ladder_emoji
+                cell = LADDER_EMOJI
             else:
                 cell = f"{num}"
-            board += f"{cell:>4}"
-        board += "\n"
-    st.text(board)
+            cells.append(f"{cell:>4}")
+        rows.append(cells)
+    return rows
+
+def draw_board(positions, snakes, ladders):
+    # st.cache_data hands back a fresh copy, so the rows can be modified in place
+    rows = base_board(tuple(snakes.items()), tuple(ladders.items()))
+    if positions[0] == positions[1]:
+        players = [(positions[0], BOTH_PLAYERS_EMOJI)]
+    else:
+        players = [(positions[0], PLAYER1_EMOJI), (positions[1], PLAYER2_EMOJI)]
+    for pos, emoji in players:
+        if 1 <= pos <= 100:
+            row, col = cell_index(pos)
+            rows[row][col] = f"{emoji:>4}"
+    st.text("".join("".join(cells) + "\n" for cells in rows))
     st.markdown("**Legend:** 🐍=Snake, 🪜=Ladder, 🔴=Player 1, 🔵=Player 2, 🟣=Both Players")
 
 draw_board(game.get_positions(), game.snakes, game.ladders)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from snake_ladder import SnakeLadderGame, _JUMP, _play_games
+
+
+def replay(rolls):
+    """Play rolls through SnakeLadderGame.move(); return (rolls used, final positions)."""
+    game = SnakeLadderGame()
+    for used, steps in enumerate(rolls, start=1):
+        game.move(steps)
+        if game.get_winner() is not None:
+            return used, game.get_positions()
+    raise AssertionError("game did not finish")
+
+
+def test_simulator_follows_move_rules():
+    rng = random.Random(7)
+    rolls = []
+
+    def roll():
+        rolls.append(rng.randint(1, 6))
+        return rolls[-1]
+
+    turns = _play_games(_JUMP, 50, roll)
+    start = 0
+    for n in turns:
+        used, positions = replay(rolls[start:start + n])
+        assert used == n
+        assert 100 in positions
+        start += n
+
+
+def test_simulate_returns_list_and_is_reproducible():
+    turns = SnakeLadderGame.simulate(200, seed=3)
+    assert isinstance(turns, list)
+    assert len(turns) == 200
+    assert all(isinstance(n, int) and n > 0 for n in turns)
+    assert turns == SnakeLadderGame.simulate(200, seed=3)
+
+
+def test_compiled_simulator_matches_python_loop():
+    pytest.importorskip("snake_ladder_jit")  # needs numpy and numba
+    import numpy as np
+    from numba import njit
+
+    from snake_ladder_jit import simulate_games
+
+    @njit
+    def draw(seed, k):
+        np.random.seed(seed)
+        out = np.empty(k, dtype=np.int64)
+        for i in range(k):
+            out[i] = np.random.randint(1, 7)
+        return out
+
+    turns = simulate_games(_JUMP, 50, 11)
+    rolls = iter(draw(11, sum(turns)).tolist())
+    assert _play_games(_JUMP, 50, lambda: next(rolls)) == turns